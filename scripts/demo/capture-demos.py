@@ -4,22 +4,41 @@
 from __future__ import annotations
 
 import argparse
+import base64
+import io
 import math
+import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import IO, Callable
 
 try:
-    from PIL import Image
+    from PIL import GifImagePlugin, Image, ImageSequence
 except ImportError as exc:  # pragma: no cover
     raise SystemExit(
         "Pillow is required. Install with: pip install pillow"
     ) from exc
 
+# Pillow's default decodes every GIF frame after the first as RGB. Keep frames
+# that share the global palette (as ffmpeg's GIF encoder writes them) in P.
+if hasattr(GifImagePlugin, "LoadingStrategy"):
+    GifImagePlugin.LOADING_STRATEGY = (
+        GifImagePlugin.LoadingStrategy.RGB_AFTER_DIFFERENT_PALETTE_ONLY
+    )
+
 try:
     from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
     from playwright.sync_api import Browser, Page, sync_playwright
@@ -28,20 +47,67 @@ except ImportError as exc:  # pragma: no cover
         "Playwright is required. Install with: pip install playwright && playwright install chromium"
     ) from exc
 
+try:
+    import av
+except ImportError:  # pragma: no cover
+    av = None  # optional: in-process WebM concat via PyAV
+
 
 ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_OUTPUT_DIR = ROOT / "docs" / "assets" / "demo"
 VIEWPORT = {"width": 1600, "height": 900}
-RESOLVED_WORKFLOW_ROUTE = "/workflows/wf_demo_claude_release"
-RESOLVED_SESSION_IDS: list[str] = []
-
-
-@dataclass
+_VP_W = VIEWPORT["width"]
+_VP_H = VIEWPORT["height"]
+# Frames end up palettized to 256 colors, so JPEG's loss is invisible in the
+# GIF while being far cheaper than PNG for Chromium to encode and ship.
+FRAME_QUALITY = 85
+SCREENCAST_FPS = 25
+# How long snap() waits for a screencast frame painted after it was called
+# before falling back to a screenshot.
+SCREENCAST_FRESH_TIMEOUT_MS = 250
+# Selectors shared across helpers and scenarios.
+SELECTORS = {
+    "new_workflow": "button:has-text('New Workflow')",
+    "ai_assist": "[aria-label='AI Assist mode']",
+    "ai_prompt": "button:has-text('AI Prompt')",
+    "flow_node": ".react-flow__node",
+    "fit_view": "button[title='Fit view'], button[title='Fit View']",
+    "zoom_in": "button[title='Zoom in'], button[title='Zoom In']",
+    "add_terminal": "button[title='Add terminal session']",
+    "open_terminal": "text=Open a terminal",
+}
+# `ffmpeg -h long` output, probed once to see which options this build has.
+FFMPEG_HELP: str | None = None
+# Encoder names from `ffmpeg -encoders`, probed once.
+FFMPEG_ENCODERS: frozenset[str] | None = None
+# (encoder, args before -i, args after -i) chosen for the MP4 transcode.
+VideoEncoder = tuple[str, list[str], list[str]]
+VIDEO_ENCODER: VideoEncoder | None = None
+SOFTWARE_H264: VideoEncoder = (
+    "libx264",
+    [],
+    ["-pix_fmt", "yuv420p", "-preset", "veryfast", "-crf", "23"],
+)
+VAAPI_DEVICE = "/dev/dri/renderD128"
+NVIDIA_DEVICE = "/dev/nvidia0"
+# Encode threads probe and demote the encoder concurrently.
+VIDEO_ENCODER_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ResolvedCtx:
+    """Demo data looked up from the running app, handed to every scenario."""
+
+    workflow_route: str
+    session_ids: tuple[str, ...]
+
+
+@dataclass(frozen=True)
 class Scenario:
     key: str
     title: str
     route: str
-    runner: Callable[[Page, Callable[[int], None]], None]
+    runner: Callable[[Page, Callable[[int], None], ResolvedCtx], None]
 
 
 def parse_args() -> argparse.Namespace:
@@ -76,6 +142,12 @@ def parse_args() -> argparse.Namespace:
         default=12.0,
         help="Target per-scenario GIF length in seconds.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Scenarios to capture in parallel, one Chromium each (default: one per scenario, capped at CPU count).",
+    )
     return parser.parse_args()
 
 
@@ -91,34 +163,94 @@ def ensure_app_ready(base_url: str) -> None:
         ) from exc
 
 
-def resolve_workflow_route(base_url: str) -> str:
-    import json
+class ApiClient:
+    """Keep-alive JSON client for the startup API probes.
+
+    The workflow and session lookups share one connection instead of paying a
+    fresh TCP handshake per request.
+    """
+
+    def __init__(self, base_url: str, *, timeout: float = 8) -> None:
+        import http.client
+        from urllib.parse import urlsplit
+
+        parsed = urlsplit(base_url)
+        connection_cls = (
+            http.client.HTTPSConnection
+            if parsed.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._conn = connection_cls(parsed.netloc, timeout=timeout)
+        self._prefix = parsed.path.rstrip("/")
+
+    def get_json(self, path: str) -> object:
+        import http.client
+        import json
+
+        for attempt in range(2):
+            try:
+                self._conn.request("GET", f"{self._prefix}{path}")
+                response = self._conn.getresponse()
+                body = response.read()
+                break
+            except (ConnectionError, http.client.BadStatusLine):
+                # The server may have dropped the idle keep-alive socket;
+                # retry once on a fresh connection before giving up.
+                self._conn.close()
+                if attempt:
+                    raise
+            except Exception:
+                # Drop the socket so the next request reconnects cleanly.
+                self._conn.close()
+                raise
+        if response.status != 200:
+            raise RuntimeError(f"GET {path} returned HTTP {response.status}")
+        return json.loads(body)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def prewarm_routes(base_url: str, routes: list[str]) -> None:
+    """Request each page once so the dev server compiles it before capture.
+
+    ``bun dev`` compiles a route on first hit; warming them together up front
+    keeps that cost out of every scenario's first navigation.
+    """
     import urllib.request
 
+    def fetch(route: str) -> None:
+        try:
+            with urllib.request.urlopen(f"{base_url}{route}", timeout=60) as response:
+                response.read()
+        except Exception:
+            pass
+
+    unique = list(dict.fromkeys(routes))
+    with ThreadPoolExecutor(max_workers=max(1, len(unique))) as pool:
+        list(pool.map(fetch, unique))
+
+
+def resolve_workflow_route(client: ApiClient) -> str:
     fallback = "/workflows/wf_demo_claude_release"
     try:
-        with urllib.request.urlopen(f"{base_url}/api/workflows", timeout=8) as response:
-            data = json.load(response)
+        data = client.get_json("/api/workflows")
     except Exception:
         return fallback
 
     if not isinstance(data, list) or not data:
         return fallback
 
-    def node_count(item: object) -> int:
-        if not isinstance(item, dict):
-            return 0
-        nodes = item.get("nodes")
-        return len(nodes) if isinstance(nodes, list) else 0
-
-    def generated_plan_score(item: object) -> int:
+    # Prefer workflows with a generated plan, then the largest graph.
+    def score(item: object) -> tuple[int, int]:
         if not isinstance(item, dict):
-            return 0
+            return (0, 0)
         plan = item.get("generatedPlan")
-        return 1 if isinstance(plan, str) and plan.strip() else 0
-
-    def score(item: object) -> tuple[int, int]:
-        return (generated_plan_score(item), node_count(item))
+        nodes = item.get("nodes")
+        return (
+            1 if isinstance(plan, str) and plan.strip() else 0,
+            len(nodes) if isinstance(nodes, list) else 0,
+        )
 
     best = max(data, key=score)
     workflow_id = best.get("id") if isinstance(best, dict) else None
@@ -127,22 +259,20 @@ def resolve_workflow_route(base_url: str) -> str:
     return fallback
 
 
-def resolve_session_ids(base_url: str, *, count: int = 3) -> list[str]:
-    import json
-    import urllib.request
+def resolve_session_ids(client: ApiClient, *, count: int = 3) -> list[str]:
     import urllib.parse
 
     params = urllib.parse.urlencode(
         {
             "sortBy": "modified_at",
             "sortDir": "DESC",
-            "limit": "80",
+            # The server filters and sorts, so only ask for the rows we keep.
+            "limit": str(count),
             "minMessages": "1",
         }
     )
     try:
-        with urllib.request.urlopen(f"{base_url}/api/sessions?{params}", timeout=8) as response:
-            data = json.load(response)
+        data = client.get_json(f"/api/sessions?{params}")
     except Exception:
         return []
 
@@ -161,141 +291,526 @@ def resolve_session_ids(base_url: str, *, count: int = 3) -> list[str]:
     return ids
 
 
-def write_gif(frame_paths: list[Path], output_path: Path, frame_ms: int) -> None:
-    if not frame_paths:
+GIF_PALETTE_FILTER = (
+    "split[a][b];"
+    "[a]palettegen=stats_mode=diff[p];"
+    "[b][p]paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle"
+)
+
+
+def optimize_gif(path: Path) -> None:
+    """Shrink a finished GIF in place with gifsicle when it is installed.
+
+    Pillow's own ``optimize=True`` pass is skipped everywhere because it is many
+    times slower; gifsicle's LZW optimizer is both faster and tighter.
+    """
+    gifsicle = shutil.which("gifsicle")
+    if not gifsicle:
+        return
+    subprocess.run(
+        [gifsicle, "-O3", "--batch", str(path)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+
+
+def log_ffmpeg_failure(output: str, returncode: int, stderr: bytes) -> None:
+    # ffmpeg stderr is raw bytes with \r progress lines and whatever the
+    # inputs' metadata encoding is; decode leniently and only on failure.
+    err = stderr.decode("utf-8", "replace").strip()
+    last_line = err.splitlines()[-1] if err else f"exit code {returncode}"
+    print(f"[ffmpeg] {Path(output).name}: {last_line}", file=sys.stderr)
+
+
+def run_ffmpeg(cmd: list[str], *, log_failure: bool = True) -> bool:
+    """Run an ffmpeg command, reading its stderr only when it fails."""
+    completed = subprocess.run(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    if completed.returncode != 0 and log_failure:
+        log_ffmpeg_failure(cmd[-1], completed.returncode, completed.stderr)
+    return completed.returncode == 0
+
+
+def wait_ffmpeg(proc: subprocess.Popen[bytes], output: Path, stderr: IO[bytes]) -> bool:
+    """Reap a streaming ffmpeg and log its spooled stderr if it failed."""
+    returncode = proc.wait()
+    if returncode != 0:
+        stderr.seek(0)
+        log_ffmpeg_failure(str(output), returncode, stderr.read())
+    stderr.close()
+    return returncode == 0
+
+
+def ffmpeg_has_option(ffmpeg: str, option: str) -> bool:
+    global FFMPEG_HELP
+    if FFMPEG_HELP is None:
+        completed = subprocess.run(
+            [ffmpeg, "-hide_banner", "-h", "long"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        FFMPEG_HELP = completed.stdout.decode("utf-8", "replace")
+    return f"-{option} " in FFMPEG_HELP
+
+
+def ffmpeg_encoders(ffmpeg: str) -> frozenset[str]:
+    global FFMPEG_ENCODERS
+    if FFMPEG_ENCODERS is None:
+        completed = subprocess.run(
+            [ffmpeg, "-hide_banner", "-encoders"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        FFMPEG_ENCODERS = frozenset(completed.stdout.decode("utf-8", "replace").split())
+    return FFMPEG_ENCODERS
+
+
+def write_gif_ffmpeg(
+    frames: list[bytes],
+    output_path: Path,
+    frame_ms: int,
+    *,
+    threads: int = 0,
+) -> bool:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return False
+    cmd = [
+        ffmpeg,
+        "-y",
+        "-f",
+        "image2pipe",
+        "-c:v",
+        "mjpeg",
+        "-framerate",
+        f"1000/{frame_ms}",
+        "-i",
+        "pipe:0",
+        "-vf",
+        GIF_PALETTE_FILTER,
+        "-loop",
+        "0",
+        "-threads",
+        str(threads),
+        str(output_path),
+    ]
+    # Spool stderr to a file: a pipe nobody drains could fill up and stall the
+    # encoder while frames are still being written to stdin.
+    stderr = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=stderr,
+    )
+    assert proc.stdin is not None
+    try:
+        for frame in frames:
+            proc.stdin.write(frame)
+    except BrokenPipeError:
+        pass
+    finally:
+        proc.stdin.close()
+    return wait_ffmpeg(proc, output_path, stderr)
+
+
+def write_gif(
+    frames: list[bytes],
+    output_path: Path,
+    frame_ms: int,
+    *,
+    threads: int = 0,
+) -> None:
+    if not frames:
         raise RuntimeError("No frames captured for GIF output")
-    frames = [Image.open(path).convert("RGB") for path in frame_paths]
-    first, rest = frames[0], frames[1:]
+    if write_gif_ffmpeg(frames, output_path, frame_ms, threads=threads):
+        optimize_gif(output_path)
+        return
+
+    # Quantize every frame against one palette built from the first frame and
+    # drop each decode as soon as it is palettized, so only one full-color
+    # frame is alive at a time and the encoder has nothing left to optimize.
+    # Hold frames repeat the same bytes object, so each is decoded only once.
+    palette: Image.Image | None = None
+    decoded_by_id: dict[int, Image.Image] = {}
+    images: list[Image.Image] = []
+    for frame in frames:
+        image = decoded_by_id.get(id(frame))
+        if image is None:
+            # JPEG screenshots decode straight to RGB, which quantize accepts
+            # as-is; skip the sniffing loop and only convert odd modes.
+            with Image.open(io.BytesIO(frame), formats=("JPEG",)) as decoded:
+                source = decoded if decoded.mode in ("RGB", "L") else decoded.convert("RGB")
+                if palette is None:
+                    palette = source.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+                image = source.quantize(palette=palette, dither=Image.Dither.FLOYDSTEINBERG)
+                if source is not decoded:
+                    source.close()
+            decoded_by_id[id(frame)] = image
+        images.append(image)
+    first, rest = images[0], images[1:]
     first.save(
         output_path,
         save_all=True,
         append_images=rest,
-        optimize=True,
+        optimize=False,
         duration=frame_ms,
         loop=0,
     )
-    for frame in frames:
-        frame.close()
+    for image in decoded_by_id.values():
+        image.close()
+    if palette is not None:
+        palette.close()
+    optimize_gif(output_path)
+
+
+def _pick_video_encoder() -> VideoEncoder:
+    """Prefer a hardware H.264 encoder this ffmpeg build ships; probed once."""
+    with VIDEO_ENCODER_LOCK:
+        if VIDEO_ENCODER is None:
+            _probe_video_encoder()
+        assert VIDEO_ENCODER is not None
+        return VIDEO_ENCODER
+
 
+def _demote_video_encoder() -> None:
+    """Stop offering a hardware encoder once it has failed at runtime."""
+    global VIDEO_ENCODER
+    with VIDEO_ENCODER_LOCK:
+        VIDEO_ENCODER = SOFTWARE_H264
 
-def maybe_convert_webm_to_mp4(webm_path: Path, mp4_path: Path) -> bool:
+
+def _probe_video_encoder() -> None:
+    global VIDEO_ENCODER
+    VIDEO_ENCODER = SOFTWARE_H264
     ffmpeg = shutil.which("ffmpeg")
     if not ffmpeg:
-        return False
-    cmd = [
-        ffmpeg,
-        "-y",
-        "-i",
-        str(webm_path),
-        "-movflags",
-        "+faststart",
-        "-pix_fmt",
-        "yuv420p",
-        str(mp4_path),
+        return
+    encoders = ffmpeg_encoders(ffmpeg)
+    candidates: list[tuple[bool, VideoEncoder]] = [
+        (
+            sys.platform == "darwin",
+            ("h264_videotoolbox", [], ["-pix_fmt", "yuv420p", "-b:v", "6M"]),
+        ),
+        (
+            os.path.exists(VAAPI_DEVICE),
+            (
+                "h264_vaapi",
+                ["-vaapi_device", VAAPI_DEVICE],
+                ["-vf", "format=nv12,hwupload", "-qp", "23"],
+            ),
+        ),
+        # Distro builds list NVENC whether or not an NVIDIA GPU is present.
+        (
+            os.path.exists(NVIDIA_DEVICE),
+            ("h264_nvenc", [], ["-pix_fmt", "yuv420p", "-preset", "p1", "-cq", "23"]),
+        ),
     ]
-    completed = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    return completed.returncode == 0 and mp4_path.exists()
+    for usable, encoder in candidates:
+        if usable and encoder[0] in encoders:
+            VIDEO_ENCODER = encoder
+            break
 
 
-def new_page(browser: Browser, video_dir: Path, provider: str):
-    context = browser.new_context(
-        viewport=VIEWPORT,
-        record_video_dir=str(video_dir),
-        record_video_size=VIEWPORT,
-    )
-    payload = (
-        '{ "state": { "providerScope": "%s" }, "version": 1 }' % provider
-    )
-    context.add_init_script(
-        f"window.localStorage.setItem('provider-scope', '{payload}');"
-    )
+# Codecs MP4 can carry as-is; anything else (VP8 from both recorders) is encoded.
+MP4_COPY_CODECS = frozenset({"h264", "vp9", "av1"})
+
+
+def _video_codec(path: Path) -> str | None:
+    """Name of the first video stream's codec, via PyAV or else ffprobe."""
+    if av is not None:
+        try:
+            with av.open(str(path)) as container:
+                return container.streams.video[0].codec_context.name
+        except (av.error.FFmpegError, IndexError):
+            return None
+    ffprobe = shutil.which("ffprobe")
+    signature = _probe_video_signature(ffprobe, path) if ffprobe else None
+    return signature.split(",")[0] if signature else None
+
+
+def maybe_convert_webm_to_mp4(webm_path: Path, mp4_path: Path, *, threads: int = 0) -> bool:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return False
+    # Remux without touching the video stream when MP4 can carry the source
+    # codec; the recorders here produce VP8, which goes straight to encoding.
+    if _video_codec(webm_path) in MP4_COPY_CODECS:
+        remux = [
+            ffmpeg,
+            "-y",
+            "-i",
+            str(webm_path),
+            "-c",
+            "copy",
+            "-movflags",
+            "+faststart",
+            str(mp4_path),
+        ]
+        if run_ffmpeg(remux, log_failure=False):
+            return True
+
+    # A listed hardware encoder can still fail at runtime (driver missing,
+    # session limit reached); libx264 stays as the last resort and the
+    # failed encoder is not offered to later transcodes.
+    encoders = [_pick_video_encoder()]
+    if encoders[0] != SOFTWARE_H264:
+        encoders.append(SOFTWARE_H264)
+    for name, input_args, output_args in encoders:
+        cmd = [
+            ffmpeg,
+            "-y",
+            *input_args,
+            "-i",
+            str(webm_path),
+            "-c:v",
+            name,
+            *output_args,
+            "-movflags",
+            "+faststart",
+            "-threads",
+            str(threads),
+            str(mp4_path),
+        ]
+        if run_ffmpeg(cmd, log_failure=name == SOFTWARE_H264[0]):
+            return True
+        if name != SOFTWARE_H264[0]:
+            _demote_video_encoder()
+    mp4_path.unlink(missing_ok=True)
+    return False
+
+
+# Seeds the provider scope and mounts the fake cursor. Installed as a single
+# init script so each navigation evaluates one script instead of several.
+DEMO_INIT_SCRIPT = """
+(() => {
+  window.localStorage.setItem('provider-scope', __PROVIDER_SCOPE__);
+
+  const style = document.createElement('style');
+  style.innerHTML = `
+    * { scroll-behavior: auto !important; }
+    #demo-cursor {
+      position: fixed;
+      left: 0;
+      top: 0;
+      width: 14px;
+      height: 14px;
+      border-radius: 9999px;
+      background: rgba(255, 255, 255, 0.95);
+      border: 1.5px solid rgba(15, 23, 42, 0.85);
+      box-shadow:
+        0 0 0 2px rgba(59, 130, 246, 0.35),
+        0 4px 14px rgba(2, 6, 23, 0.3);
+      transform: translate(-50%, -50%);
+      pointer-events: none;
+      z-index: 2147483647;
+      transition:
+        width 80ms ease,
+        height 80ms ease,
+        box-shadow 80ms ease;
+    }
+    #demo-cursor.demo-cursor-down {
+      width: 11px;
+      height: 11px;
+      box-shadow:
+        0 0 0 3px rgba(59, 130, 246, 0.45),
+        0 2px 10px rgba(2, 6, 23, 0.26);
+    }
+  `;
+  document.head.appendChild(style);
+
+  const mountCursor = () => {
+    if (document.getElementById('demo-cursor')) return;
+    const cursor = document.createElement('div');
+    cursor.id = 'demo-cursor';
+    cursor.setAttribute('aria-hidden', 'true');
+    cursor.style.left = '120px';
+    cursor.style.top = '120px';
+    document.body.appendChild(cursor);
+
+    const move = (x, y) => {
+      cursor.style.left = `${x}px`;
+      cursor.style.top = `${y}px`;
+    };
+
+    document.addEventListener(
+      'mousemove',
+      (event) => move(event.clientX, event.clientY),
+      { passive: true },
+    );
+    document.addEventListener(
+      'pointermove',
+      (event) => move(event.clientX, event.clientY),
+      { passive: true },
+    );
+    document.addEventListener(
+      'mousedown',
+      () => cursor.classList.add('demo-cursor-down'),
+      { passive: true },
+    );
+    document.addEventListener(
+      'mouseup',
+      () => cursor.classList.remove('demo-cursor-down'),
+      { passive: true },
+    );
+  };
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', mountCursor, {
+      once: true,
+    });
+  } else {
+    mountCursor();
+  }
+})();
+"""
+
+
+def new_page(browser: Browser, video_dir: Path | None, provider: str):
+    import json
+
+    if video_dir is None:
+        context = browser.new_context(viewport=VIEWPORT)
+    else:
+        context = browser.new_context(
+            viewport=VIEWPORT,
+            record_video_dir=str(video_dir),
+            record_video_size=VIEWPORT,
+        )
+    payload = json.dumps({"state": {"providerScope": provider}, "version": 1})
     context.add_init_script(
-        """
-        (() => {
-          const style = document.createElement('style');
-          style.innerHTML = `
-            * { scroll-behavior: auto !important; }
-            #demo-cursor {
-              position: fixed;
-              left: 0;
-              top: 0;
-              width: 14px;
-              height: 14px;
-              border-radius: 9999px;
-              background: rgba(255, 255, 255, 0.95);
-              border: 1.5px solid rgba(15, 23, 42, 0.85);
-              box-shadow:
-                0 0 0 2px rgba(59, 130, 246, 0.35),
-                0 4px 14px rgba(2, 6, 23, 0.3);
-              transform: translate(-50%, -50%);
-              pointer-events: none;
-              z-index: 2147483647;
-              transition:
-                width 80ms ease,
-                height 80ms ease,
-                box-shadow 80ms ease;
-            }
-            #demo-cursor.demo-cursor-down {
-              width: 11px;
-              height: 11px;
-              box-shadow:
-                0 0 0 3px rgba(59, 130, 246, 0.45),
-                0 2px 10px rgba(2, 6, 23, 0.26);
-            }
-          `;
-          document.head.appendChild(style);
-
-          const mountCursor = () => {
-            if (document.getElementById('demo-cursor')) return;
-            const cursor = document.createElement('div');
-            cursor.id = 'demo-cursor';
-            cursor.setAttribute('aria-hidden', 'true');
-            cursor.style.left = '120px';
-            cursor.style.top = '120px';
-            document.body.appendChild(cursor);
-
-            const move = (x, y) => {
-              cursor.style.left = `${x}px`;
-              cursor.style.top = `${y}px`;
-            };
-
-            document.addEventListener(
-              'mousemove',
-              (event) => move(event.clientX, event.clientY),
-              { passive: true },
-            );
-            document.addEventListener(
-              'pointermove',
-              (event) => move(event.clientX, event.clientY),
-              { passive: true },
-            );
-            document.addEventListener(
-              'mousedown',
-              () => cursor.classList.add('demo-cursor-down'),
-              { passive: true },
-            );
-            document.addEventListener(
-              'mouseup',
-              () => cursor.classList.remove('demo-cursor-down'),
-              { passive: true },
-            );
-          };
-
-          if (document.readyState === 'loading') {
-            document.addEventListener('DOMContentLoaded', mountCursor, {
-              once: true,
-            });
-          } else {
-            mountCursor();
-          }
-        })();
-        """
+        DEMO_INIT_SCRIPT.replace("__PROVIDER_SCOPE__", json.dumps(payload))
     )
     page = context.new_page()
     page.set_default_timeout(18_000)
     return context, page
 
 
+class ScreencastRecorder:
+    """Record a page through CDP screencast into a WebM via piped ffmpeg.
+
+    Chromium only emits a screencast frame when the page repaints, so each
+    frame is repeated until the next one arrives to keep the output at a
+    constant ``SCREENCAST_FPS``. The latest frame doubles as the GIF frame
+    source, which saves a separate screenshot encode per ``snap()``.
+    """
+
+    def __init__(self, context, page: Page, output_path: Path, *, threads: int = 0) -> None:
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg is required for screencast recording")
+        # Same VP8 settings Playwright's own recorder uses.
+        cmd = [
+            ffmpeg,
+            "-y",
+            "-f",
+            "image2pipe",
+            "-c:v",
+            "mjpeg",
+            "-framerate",
+            str(SCREENCAST_FPS),
+            "-i",
+            "pipe:0",
+            "-c:v",
+            "libvpx",
+            "-qmin",
+            "0",
+            "-qmax",
+            "50",
+            "-crf",
+            "8",
+            "-deadline",
+            "realtime",
+            "-speed",
+            "8",
+            "-b:v",
+            "1M",
+            "-threads",
+            str(threads),
+            str(output_path),
+        ]
+        self.output_path = output_path
+        self.latest: bytes | None = None
+        # Browser-side swap time (seconds since epoch) of ``latest``.
+        self.latest_timestamp = 0.0
+        self._stderr = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr,
+        )
+        self._started_at: float | None = None
+        self._written = 0
+        try:
+            self._session = context.new_cdp_session(page)
+            self._session.on("Page.screencastFrame", self._on_frame)
+            self._session.send(
+                "Page.startScreencast",
+                {
+                    "format": "jpeg",
+                    "quality": FRAME_QUALITY,
+                    "maxWidth": _VP_W,
+                    "maxHeight": _VP_H,
+                    "everyNthFrame": 1,
+                },
+            )
+        except BaseException:
+            # Don't leave ffmpeg waiting on an open stdin.
+            self._proc.kill()
+            self._proc.wait()
+            self._stderr.close()
+            raise
+
+    def _on_frame(self, params: dict) -> None:
+        self._session.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+        timestamp = params.get("metadata", {}).get("timestamp") or time.time()
+        self._advance(float(timestamp))
+        self.latest = base64.b64decode(params["data"])
+        self.latest_timestamp = float(timestamp)
+
+    def _advance(self, timestamp: float) -> None:
+        """Repeat the latest frame up to ``timestamp`` on the output clock."""
+        if self._started_at is None:
+            self._started_at = timestamp
+        if self.latest is None or self._proc.stdin is None:
+            return
+        due = int((timestamp - self._started_at) * SCREENCAST_FPS)
+        try:
+            while self._written < due:
+                self._proc.stdin.write(self.latest)
+                self._written += 1
+        except BrokenPipeError:
+            pass
+
+    def stop(self) -> bool:
+        try:
+            self._session.send("Page.stopScreencast")
+            self._session.detach()
+        except Exception:
+            pass
+        self._advance(time.time())
+        assert self._proc.stdin is not None
+        try:
+            if self._written == 0 and self.latest is not None:
+                self._proc.stdin.write(self.latest)
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        return wait_ffmpeg(self._proc, self.output_path, self._stderr)
+
+
 def _origin_from_page(page: Page) -> str:
     from urllib.parse import urlsplit
 
@@ -307,6 +822,22 @@ def _goto_same_origin(page: Page, route: str) -> None:
     page.goto(f"{_origin_from_page(page)}{route}", wait_until="domcontentloaded")
 
 
+def _wait_until(page: Page, expression: str, *, arg: object = None, timeout: int = 2000) -> None:
+    """Wait for a DOM condition, treating ``timeout`` as an upper bound only.
+
+    Used in place of fixed sleeps where the scenario is really waiting for a
+    specific UI transition, so fast machines move on as soon as it lands.
+    """
+    try:
+        page.wait_for_function(expression, arg=arg, timeout=timeout)
+    except PlaywrightTimeoutError:
+        pass
+
+
+def _wait_for_value(page: Page, value: str, *, timeout: int = 2000) -> None:
+    _wait_until(page, "(value) => document.activeElement?.value === value", arg=value, timeout=timeout)
+
+
 def _human_click(page: Page, locator, hold: Callable[[int], None], *, after: int = 2) -> bool:
     if locator.count() == 0:
         return False
@@ -328,41 +859,61 @@ def _click_if_in_view(page: Page, locator, hold: Callable[[int], None], *, after
     box = locator.bounding_box()
     if not box:
         return False
-    right = box["x"] + box["width"]
-    bottom = box["y"] + box["height"]
-    if right < 0 or bottom < 0:
-        return False
-    if box["x"] > VIEWPORT["width"] or box["y"] > VIEWPORT["height"]:
+    x, y = box["x"], box["y"]
+    if x + box["width"] < 0 or y + box["height"] < 0 or x > _VP_W or y > _VP_H:
         return False
     return _human_click(page, locator, hold, after=after)
 
 
-def scenario_workflow_builder(page: Page, hold: Callable[[int], None]) -> None:
+def _in_view_indexes(page: Page, selector: str) -> list[int]:
+    """Indexes of ``selector`` matches whose box overlaps the viewport.
+
+    One evaluate call replaces a ``count()`` + ``bounding_box()`` round-trip
+    per candidate when scanning many nodes.
+    """
+    return page.evaluate(
+        """
+        ([selector, width, height]) =>
+          Array.from(document.querySelectorAll(selector)).flatMap((node, index) => {
+            const box = node.getBoundingClientRect();
+            if (box.width === 0 && box.height === 0) return [];
+            if (box.right < 0 || box.bottom < 0) return [];
+            if (box.left > width || box.top > height) return [];
+            return [index];
+          })
+        """,
+        [selector, _VP_W, _VP_H],
+    )
+
+
+def scenario_workflow_builder(page: Page, hold: Callable[[int], None], ctx: ResolvedCtx) -> None:
     # 1) Start with AI Assist in workflows list.
-    page.wait_for_selector("button:has-text('New Workflow')")
+    page.wait_for_selector(SELECTORS["new_workflow"])
     page.wait_for_timeout(240)
     hold(3)
 
-    _human_click(page, page.locator("button:has-text('New Workflow')").first, hold, after=3)
-    page.wait_for_selector("[aria-label='AI Assist mode']")
-    _human_click(page, page.locator("[aria-label='AI Assist mode']").first, hold, after=3)
+    _human_click(page, page.locator(SELECTORS["new_workflow"]).first, hold, after=3)
+    page.wait_for_selector(SELECTORS["ai_assist"])
+    _human_click(page, page.locator(SELECTORS["ai_assist"]).first, hold, after=3)
 
     prompt_area = page.locator(
         "textarea[placeholder*='Review all PRs'], textarea[placeholder*='workflow do']"
     ).first
     if prompt_area.count() > 0:
         _human_click(page, prompt_area, hold, after=2)
-        prompt_area.fill(
+        prompt_text = (
             "Plan and execute a release workflow with task planning, implementation, verification, and deployment notes."
         )
-        page.wait_for_timeout(220)
+        prompt_area.fill(prompt_text)
+        _wait_for_value(page, prompt_text)
         hold(3)
 
     name_input = page.locator("input[placeholder*='Auto-derived from prompt']").first
     if name_input.count() > 0:
         _human_click(page, name_input, hold, after=2)
-        name_input.fill("Release Train AI Workflow")
-        page.wait_for_timeout(160)
+        name_text = "Release Train AI Workflow"
+        name_input.fill(name_text)
+        _wait_for_value(page, name_text)
         hold(2)
 
     detail_depth = page.locator("[aria-label='Detailed planning depth']").first
@@ -376,17 +927,17 @@ def scenario_workflow_builder(page: Page, hold: Callable[[int], None]) -> None:
         hold(5)
 
     # 2) Jump to finished workflow state and inspect/edit.
-    _goto_same_origin(page, RESOLVED_WORKFLOW_ROUTE)
+    _goto_same_origin(page, ctx.workflow_route)
     page.wait_for_selector(".react-flow")
     try:
-        page.wait_for_selector(".react-flow__node", timeout=6000)
+        page.wait_for_selector(SELECTORS["flow_node"], timeout=6000)
     except PlaywrightTimeoutError:
         pass
     page.wait_for_timeout(250)
     hold(4)
 
     _human_click(page, page.get_by_role("button", name="Fullscreen").first, hold, after=4)
-    fit_view = page.locator("button[title='Fit view'], button[title='Fit View']").first
+    fit_view = page.locator(SELECTORS["fit_view"]).first
     if fit_view.count() > 0:
         _human_click(page, fit_view, hold, after=3)
 
@@ -395,14 +946,15 @@ def scenario_workflow_builder(page: Page, hold: Callable[[int], None]) -> None:
         if toggle.count() > 0:
             _human_click(page, toggle, hold, after=2)
 
-    zoom_in = page.locator("button[title='Zoom in'], button[title='Zoom In']").first
+    zoom_in = page.locator(SELECTORS["zoom_in"]).first
     if zoom_in.count() > 0:
         for _ in range(2):
             _human_click(page, zoom_in, hold, after=2)
 
-    target_node = page.locator(".react-flow__node:has-text('Implement')").first
+    nodes = page.locator(SELECTORS["flow_node"])
+    target_node = nodes.filter(has_text="Implement").first
     if target_node.count() == 0:
-        target_node = page.locator(".react-flow__node").first
+        target_node = nodes.first
     if _click_if_in_view(page, target_node, hold, after=4):
         box = target_node.bounding_box()
         if box:
@@ -415,18 +967,18 @@ def scenario_workflow_builder(page: Page, hold: Callable[[int], None]) -> None:
             page.wait_for_timeout(220)
             hold(4)
 
-    ai_prompt_btn = page.locator("button:has-text('AI Prompt')").first
+    ai_prompt_btn = page.locator(SELECTORS["ai_prompt"]).first
     if ai_prompt_btn.count() > 0:
         _human_click(page, ai_prompt_btn, hold, after=3)
     collapse_ai_prompt = page.locator("button[title='Collapse AI prompt']").first
     if collapse_ai_prompt.count() > 0:
         _human_click(page, collapse_ai_prompt, hold, after=2)
-        _human_click(page, page.locator("button:has-text('AI Prompt')").first, hold, after=3)
+        _human_click(page, ai_prompt_btn, hold, after=3)
 
-    visible_node_count = page.locator(".react-flow__node").count()
+    in_view = set(_in_view_indexes(page, SELECTORS["flow_node"]))
     for idx in (1, 2, 3):
-        if visible_node_count > idx:
-            if _click_if_in_view(page, page.locator(".react-flow__node").nth(idx), hold, after=2):
+        if idx in in_view:
+            if _human_click(page, nodes.nth(idx), hold, after=2):
                 page.wait_for_timeout(150)
                 hold(1)
 
@@ -454,7 +1006,7 @@ def scenario_workflow_builder(page: Page, hold: Callable[[int], None]) -> None:
     hold(7)
 
 
-def scenario_routing(page: Page, hold: Callable[[int], None]) -> None:
+def scenario_routing(page: Page, hold: Callable[[int], None], ctx: ResolvedCtx) -> None:
     page.wait_for_selector("text=Routing Graph")
     page.wait_for_timeout(420)
     hold(4)
@@ -463,12 +1015,12 @@ def scenario_routing(page: Page, hold: Callable[[int], None]) -> None:
     if fullscreen_btn.count() > 0:
         _human_click(page, fullscreen_btn, hold, after=4)
 
-    fit_view = page.locator("button[title='Fit view'], button[title='Fit View']").first
+    fit_view = page.locator(SELECTORS["fit_view"]).first
     if fit_view.count() > 0:
         _human_click(page, fit_view, hold, after=3)
 
     # Zoom for readability while still keeping a broad node set on screen.
-    zoom_in = page.locator("button[title='Zoom in'], button[title='Zoom In']").first
+    zoom_in = page.locator(SELECTORS["zoom_in"]).first
     if zoom_in.count() > 0:
         for _ in range(2):
             _human_click(page, zoom_in, hold, after=2)
@@ -488,14 +1040,9 @@ def scenario_routing(page: Page, hold: Callable[[int], None]) -> None:
             hold(3)
 
     # Click through up to 10 visible nodes so users can actually read/inspect them.
-    nodes = page.locator(".react-flow__node")
-    total_nodes = nodes.count()
-    clicked = 0
-    for idx in range(total_nodes):
-        if clicked >= 10:
-            break
-        if _click_if_in_view(page, nodes.nth(idx), hold, after=2):
-            clicked += 1
+    nodes = page.locator(SELECTORS["flow_node"])
+    for idx in _in_view_indexes(page, SELECTORS["flow_node"])[:10]:
+        if _human_click(page, nodes.nth(idx), hold, after=2):
             page.wait_for_timeout(120)
 
     hold(8)
@@ -514,19 +1061,19 @@ def scenario_routing(page: Page, hold: Callable[[int], None]) -> None:
     hold(6)
 
 
-def scenario_console(page: Page, hold: Callable[[int], None]) -> None:
+def scenario_console(page: Page, hold: Callable[[int], None], ctx: ResolvedCtx) -> None:
     try:
-        page.wait_for_selector("button[title='Add terminal session']", timeout=7000)
+        page.wait_for_selector(SELECTORS["add_terminal"], timeout=7000)
     except PlaywrightTimeoutError:
         try:
             page.wait_for_selector("button:has-text('New Workspace')", timeout=7000)
         except PlaywrightTimeoutError:
-            page.wait_for_selector("text=Open a terminal", timeout=7000)
+            page.wait_for_selector(SELECTORS["open_terminal"], timeout=7000)
     page.wait_for_timeout(520)
     hold(5)
 
     # Create/open session content so terminal layout is visible.
-    add_terminal_btn = page.locator("button[title='Add terminal session']").first
+    add_terminal_btn = page.locator(SELECTORS["add_terminal"]).first
     if add_terminal_btn.count() > 0:
         _human_click(page, add_terminal_btn, hold, after=3)
         page.wait_for_timeout(550)
@@ -597,12 +1144,12 @@ def scenario_console(page: Page, hold: Callable[[int], None]) -> None:
     hold(8)
 
 
-def scenario_sessions_journey(page: Page, hold: Callable[[int], None]) -> None:
+def scenario_sessions_journey(page: Page, hold: Callable[[int], None], ctx: ResolvedCtx) -> None:
     # Console start.
     try:
-        page.wait_for_selector("button[title='Add terminal session']", timeout=7000)
+        page.wait_for_selector(SELECTORS["add_terminal"], timeout=7000)
     except PlaywrightTimeoutError:
-        page.wait_for_selector("text=Open a terminal", timeout=7000)
+        page.wait_for_selector(SELECTORS["open_terminal"], timeout=7000)
     page.wait_for_timeout(380)
     hold(3)
 
@@ -621,8 +1168,8 @@ def scenario_sessions_journey(page: Page, hold: Callable[[int], None]) -> None:
 
     # Open a concrete session detail.
     opened = False
-    if RESOLVED_SESSION_IDS:
-        detail_route = f"/sessions/{RESOLVED_SESSION_IDS[0]}"
+    if ctx.session_ids:
+        detail_route = f"/sessions/{ctx.session_ids[0]}"
         detail_link = page.locator(f"a[href='{detail_route}']").first
         if detail_link.count() > 0:
             opened = _human_click(page, detail_link, hold, after=4)
@@ -642,7 +1189,7 @@ def scenario_sessions_journey(page: Page, hold: Callable[[int], None]) -> None:
     hold(4)
 
     # Scroll through detail + transcript area.
-    page.mouse.move(VIEWPORT["width"] * 0.62, VIEWPORT["height"] * 0.72, steps=18)
+    page.mouse.move(_VP_W * 0.62, _VP_H * 0.72, steps=18)
     page.mouse.wheel(0, 560)
     page.wait_for_timeout(220)
     hold(3)
@@ -663,7 +1210,7 @@ def scenario_sessions_journey(page: Page, hold: Callable[[int], None]) -> None:
             _human_click(page, tool_option, hold, after=2)
 
     # Scroll deeper into session detail and open tool Input / Result payloads.
-    page.mouse.move(VIEWPORT["width"] * 0.65, VIEWPORT["height"] * 0.72, steps=18)
+    page.mouse.move(_VP_W * 0.65, _VP_H * 0.72, steps=18)
     page.mouse.wheel(0, 760)
     page.wait_for_timeout(220)
     hold(3)
@@ -681,14 +1228,14 @@ def scenario_sessions_journey(page: Page, hold: Callable[[int], None]) -> None:
         _human_click(page, input_toggle, hold, after=2)
 
     # Final look around on expanded details.
-    page.mouse.move(VIEWPORT["width"] * 0.76, VIEWPORT["height"] * 0.48, steps=16)
+    page.mouse.move(_VP_W * 0.76, _VP_H * 0.48, steps=16)
     page.wait_for_timeout(180)
     hold(7)
 
 
-def scenario_review_compare(page: Page, hold: Callable[[int], None]) -> None:
-    if len(RESOLVED_SESSION_IDS) >= 2:
-        ids_param = ",".join(RESOLVED_SESSION_IDS[:2])
+def scenario_review_compare(page: Page, hold: Callable[[int], None], ctx: ResolvedCtx) -> None:
+    if len(ctx.session_ids) >= 2:
+        ids_param = ",".join(ctx.session_ids[:2])
         _goto_same_origin(page, f"/analyze?ids={ids_param}&scope=metrics,summaries")
     else:
         _goto_same_origin(page, "/analyze")
@@ -726,13 +1273,33 @@ def scenario_review_compare(page: Page, hold: Callable[[int], None]) -> None:
     input_box = page.locator("textarea[placeholder='Ask a follow-up question...']").first
     if input_box.count() > 0:
         _human_click(page, input_box, hold, after=2)
-        input_box.fill("Compare these two sessions and highlight the better execution strategy.")
-        page.wait_for_timeout(200)
+        question = "Compare these two sessions and highlight the better execution strategy."
+        input_box.fill(question)
+        _wait_for_value(page, question)
         hold(3)
 
     hold(6)
 
 
+def encode_scenario(
+    frames: list[bytes],
+    video_path: Path | None,
+    out_dir: Path,
+    key: str,
+    frame_ms: int,
+    threads: int,
+) -> None:
+    write_gif(frames, out_dir / f"{key}.gif", frame_ms=frame_ms, threads=threads)
+
+    if video_path and video_path.exists():
+        webm_path = out_dir / f"{key}.webm"
+        # _raw-video lives under out_dir and is discarded after the run, so a
+        # rename replaces a full copy of the recording.
+        shutil.move(video_path, webm_path)
+        mp4_path = out_dir / f"{key}.mp4"
+        maybe_convert_webm_to_mp4(webm_path, mp4_path, threads=threads)
+
+
 def capture_scenario(
     browser: Browser,
     base_url: str,
@@ -741,162 +1308,515 @@ def capture_scenario(
     scenario: Scenario,
     frame_ms: int,
     target_seconds: float,
-) -> None:
-    frames_dir = out_dir / "_frames" / scenario.key
-    frames_dir.mkdir(parents=True, exist_ok=True)
+    *,
+    ctx: ResolvedCtx,
+    encode_pool: Executor,
+    encode_threads: int = 0,
+) -> Future[None]:
+    """Record one scenario, then hand GIF/MP4 encoding to ``encode_pool``.
+
+    With ffmpeg available the page is recorded through CDP screencast and GIF
+    frames come from that same stream when a frame newer than the snap has
+    arrived (else a screenshot); otherwise Playwright's video recorder and
+    per-frame screenshots are used. Frames are kept in memory as encoded
+    JPEG bytes; hold frames reuse the same bytes object, so duplication costs
+    a list slot rather than a copy. Encoding only needs those frames and the
+    raw video, so it overlaps with the browser capture of the next scenario.
+    """
     video_dir = out_dir / "_raw-video"
     video_dir.mkdir(parents=True, exist_ok=True)
+    # The screencast is encoded with libvpx; ffmpeg builds without it keep
+    # Playwright's own recorder so the scenario still gets a WebM.
+    ffmpeg = shutil.which("ffmpeg")
+    use_screencast = ffmpeg is not None and "libvpx" in ffmpeg_encoders(ffmpeg)
 
-    frame_paths: list[Path] = []
-    frame_index = 0
+    frames: list[bytes] = []
+    recorder: ScreencastRecorder | None = None
 
     def snap(duplication: int = 1) -> None:
-        nonlocal frame_index
-        shot = frames_dir / f"{frame_index:04d}.png"
-        page.screenshot(path=str(shot), full_page=False)
-        frame_paths.extend([shot] * max(duplication, 1))
-        frame_index += 1
-
-    context, page = new_page(browser, video_dir, provider)
+        shot = None
+        if recorder is not None:
+            # Screencast frames arrive as separate CDP events with no ordering
+            # guarantee against page calls, so only reuse one whose swap time
+            # is after this snap was requested. Pages that do not repaint send
+            # no new frame and take the screenshot below instead.
+            requested_at = time.time()
+            page.evaluate(
+                "() => new Promise((r) => requestAnimationFrame(() => requestAnimationFrame(r)))"
+            )
+            deadline = requested_at + SCREENCAST_FRESH_TIMEOUT_MS / 1000
+            while recorder.latest_timestamp < requested_at and time.time() < deadline:
+                # Sync Playwright only dispatches CDP events while it waits.
+                page.wait_for_timeout(10)
+            if recorder.latest_timestamp >= requested_at:
+                shot = recorder.latest
+        if shot is None:
+            shot = page.screenshot(type="jpeg", quality=FRAME_QUALITY, full_page=False)
+        frames.extend([shot] * max(duplication, 1))
+
+    context, page = new_page(browser, None if use_screencast else video_dir, provider)
     try:
+        if use_screencast:
+            recorder = ScreencastRecorder(
+                context,
+                page,
+                video_dir / f"{scenario.key}.webm",
+                threads=encode_threads,
+            )
         page.goto(f"{base_url}{scenario.route}", wait_until="domcontentloaded")
         page.wait_for_timeout(850)
         page.mouse.move(140, 120)
         page.wait_for_timeout(60)
         snap(6)
-        scenario.runner(page, snap)
+        scenario.runner(page, snap, ctx)
         page.wait_for_timeout(300)
         snap(5)
     except PlaywrightTimeoutError as exc:
         raise RuntimeError(f"Scenario '{scenario.key}' timed out") from exc
     finally:
+        video_path: Path | None = None
+        if recorder is not None and recorder.stop():
+            video_path = recorder.output_path
         page.close()
         video = page.video
-        video_path = Path(video.path()) if video is not None else None
+        if video is not None:
+            video_path = Path(video.path())
         context.close()
 
-    gif_path = out_dir / f"{scenario.key}.gif"
-    webm_path = out_dir / f"{scenario.key}.webm"
     target_frames = max(1, math.ceil((target_seconds * 1000) / frame_ms))
-    if frame_paths and len(frame_paths) > target_frames:
+    if frames and len(frames) > target_frames:
         if target_frames == 1:
-            frame_paths = [frame_paths[-1]]
+            frames = [frames[-1]]
         else:
-            last_index = len(frame_paths) - 1
-            selected = []
-            for i in range(target_frames):
-                idx = round((i * last_index) / (target_frames - 1))
-                selected.append(frame_paths[idx])
-            frame_paths = selected
-    if frame_paths and len(frame_paths) < target_frames:
-        frame_paths.extend([frame_paths[-1]] * (target_frames - len(frame_paths)))
-    write_gif(frame_paths, gif_path, frame_ms=frame_ms)
+            # Evenly spaced picks from first to last frame, rounded half-up in
+            # integer math so the selection never drifts with float error.
+            last_index = len(frames) - 1
+            span = target_frames - 1
+            frames = [
+                frames[(2 * i * last_index + span) // (2 * span)]
+                for i in range(target_frames)
+            ]
+    if frames and len(frames) < target_frames:
+        frames.extend([frames[-1]] * (target_frames - len(frames)))
+    return encode_pool.submit(
+        encode_scenario,
+        frames,
+        video_path,
+        out_dir,
+        scenario.key,
+        frame_ms,
+        encode_threads,
+    )
 
-    if video_path and video_path.exists():
-        shutil.copy2(video_path, webm_path)
-        mp4_path = out_dir / f"{scenario.key}.mp4"
-        maybe_convert_webm_to_mp4(webm_path, mp4_path)
+
+def capture_batch(
+    scenarios: list[Scenario],
+    *,
+    base_url: str,
+    out_dir: Path,
+    provider: str,
+    frame_ms: int,
+    target_seconds: float,
+    ctx: ResolvedCtx,
+    encode_threads: int,
+) -> list[str]:
+    """Capture ``scenarios`` in one Chromium; safe to run in a worker process."""
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        try:
+            # Each scenario's GIF/MP4 encode runs while the next one is captured.
+            with ThreadPoolExecutor(max_workers=max(1, len(scenarios))) as encode_pool:
+                pending: list[Future[None]] = []
+                for scenario in scenarios:
+                    print(f"[capture] {scenario.key}", flush=True)
+                    pending.append(
+                        capture_scenario(
+                            browser=browser,
+                            base_url=base_url,
+                            out_dir=out_dir,
+                            provider=provider,
+                            scenario=scenario,
+                            frame_ms=frame_ms,
+                            target_seconds=target_seconds,
+                            ctx=ctx,
+                            encode_pool=encode_pool,
+                            encode_threads=encode_threads,
+                        )
+                    )
+                for future in pending:
+                    future.result()
+        finally:
+            browser.close()
+    return [scenario.key for scenario in scenarios]
+
+
+def build_reel_palette(source: Path, *, every: int = 8) -> Image.Image | None:
+    """Median-cut one 256-color palette from every ``every``-th frame of ``source``.
+
+    All scenarios render the same app chrome, so a palette sampled from one
+    capture fits the others; sharing it skips per-frame quantization.
+    """
+    samples: list[Image.Image] = []
+    with Image.open(source) as img:
+        for index, frame in enumerate(ImageSequence.Iterator(img)):
+            if index % every == 0:
+                # Downscaled samples keep the colors at a fraction of the pixels.
+                samples.append(frame.convert("RGB").reduce(4))
+    if not samples:
+        return None
+    width, height = samples[0].size
+    mosaic = Image.new("RGB", (width, height * len(samples)))
+    for index, sample in enumerate(samples):
+        mosaic.paste(sample, (0, index * height))
+        sample.close()
+    palette = mosaic.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+    mosaic.close()
+    return palette
+
+
+def _apply_palette(image: Image.Image, palette: Image.Image | None) -> Image.Image:
+    if palette is None:
+        return image.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    rgb = image if image.mode == "RGB" else image.convert("RGB")
+    return rgb.quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+def _decode_gif_pil(
+    source: Path, default_duration_ms: int, palette: Image.Image | None
+) -> tuple[list[Image.Image], list[int]]:
+    frames: list[Image.Image] = []
+    durations: list[int] = []
+    with Image.open(source) as img:
+        for frame in ImageSequence.Iterator(img):
+            frames.append(frame.copy() if palette is None else _apply_palette(frame, palette))
+            durations.append(int(frame.info.get("duration", default_duration_ms)))
+    return frames, durations
+
+
+def _decode_gif_pyav(
+    source: Path, default_duration_ms: int, palette: Image.Image | None
+) -> tuple[list[Image.Image], list[int]] | None:
+    """Decode a GIF through PyAV (libavcodec's gif decoder); None if it cannot.
+
+    The gif decoder has no frame or slice threading, and every frame is still
+    converted to RGB and re-quantized in Pillow, so this does the same
+    per-frame work as the Pillow path.
+    """
+    if av is None:
+        return None
+    frames: list[Image.Image] = []
+    durations: list[int] = []
+    try:
+        with av.open(str(source)) as container:
+            stream = container.streams.video[0]
+            time_base = stream.time_base
+            for frame in container.decode(stream):
+                # libavcodec hands back full-color frames; re-palettize at once
+                # so a reel holds the same per-frame footprint as the PIL path.
+                frames.append(_apply_palette(frame.to_image(), palette))
+                duration = getattr(frame, "duration", None)
+                durations.append(
+                    int(duration * time_base * 1000)
+                    if duration and time_base
+                    else default_duration_ms
+                )
+    except (av.error.FFmpegError, IndexError, ValueError):
+        for frame in frames:
+            frame.close()
+        return None
+    return frames, durations
 
 
 def stitch_gifs(
     sources: list[Path],
-    output: Path,
+    outputs: list[tuple[Path, int]],
     *,
     default_duration_ms: int,
-    separator_hold_frames: int = 0,
+    decoder: str = "pil",
+    palette: Image.Image | None = None,
 ) -> None:
-    frames: list[Image.Image] = []
-    durations: list[int] = []
-    for i, source in enumerate(sources):
-        if not source.exists():
-            continue
-        with Image.open(source) as img:
-            while True:
-                frame = img.convert("RGB").copy()
-                frames.append(frame)
-                durations.append(int(img.info.get("duration", default_duration_ms)))
-                try:
-                    img.seek(img.tell() + 1)
-                except EOFError:
-                    break
-        if separator_hold_frames > 0 and i < len(sources) - 1 and frames:
-            for _ in range(separator_hold_frames):
-                frames.append(frames[-1].copy())
-                durations.append(default_duration_ms)
+    """Concatenate ``sources`` into each ``(output, separator_hold_frames)`` reel.
+
+    Every source is decoded once and the frames are shared by all outputs;
+    reels only differ in how many copies of a segment's last frame they hold
+    before the next segment starts. ``sources`` must already exist.
+
+    ``decoder="pyav"`` decodes through PyAV when it is installed and falls
+    back to Pillow per source otherwise. With ``palette``, every frame is
+    mapped onto that shared palette without dither.
+    """
+    # Frames keep the mode Pillow decodes them in: P for frames on the global
+    # palette, RGB for frames carrying a local one (Pillow-written GIFs).
+    segments: list[tuple[list[Image.Image], list[int]]] = []
+    for source in sources:
+        decoded = (
+            _decode_gif_pyav(source, default_duration_ms, palette)
+            if decoder == "pyav"
+            else None
+        )
+        seg_frames, seg_durations = decoded or _decode_gif_pil(
+            source, default_duration_ms, palette
+        )
+        if seg_frames:
+            segments.append((seg_frames, seg_durations))
 
-    if not frames:
+    if not segments:
         return
-    first, rest = frames[0], frames[1:]
-    first.save(
-        output,
-        save_all=True,
-        append_images=rest,
-        optimize=True,
-        duration=durations,
-        loop=0,
+    for output, separator_hold_frames in outputs:
+        frames: list[Image.Image] = []
+        durations: list[int] = []
+        for i, (seg_frames, seg_durations) in enumerate(segments):
+            frames.extend(seg_frames)
+            durations.extend(seg_durations)
+            if separator_hold_frames > 0 and i < len(segments) - 1:
+                frames.extend([seg_frames[-1]] * separator_hold_frames)
+                durations.extend([default_duration_ms] * separator_hold_frames)
+        first, rest = frames[0], frames[1:]
+        first.save(
+            output,
+            save_all=True,
+            append_images=rest,
+            optimize=False,
+            duration=durations,
+            loop=0,
+        )
+        optimize_gif(output)
+    for seg_frames, _ in segments:
+        for frame in seg_frames:
+            frame.close()
+
+
+def _concat_webm_pyav(sources: list[Path], output: Path) -> bool:
+    """Remux recordings in-process with PyAV, shifting timestamps per segment.
+
+    Returns False (so ffmpeg takes over) when PyAV is missing or the inputs do
+    not share one codec and frame size.
+    """
+    if av is None:
+        return False
+    try:
+        with av.open(str(output), mode="w", format="webm") as out:
+            out_stream = None
+            signature = None
+            offset = 0.0  # seconds already written by earlier segments
+            for source in sources:
+                with av.open(str(source)) as src:
+                    in_stream = src.streams.video[0]
+                    ctx = in_stream.codec_context
+                    current = (ctx.name, ctx.width, ctx.height)
+                    if out_stream is None:
+                        add_from_template = getattr(out, "add_stream_from_template", None)
+                        out_stream = (
+                            add_from_template(in_stream)
+                            if add_from_template is not None
+                            else out.add_stream(template=in_stream)
+                        )
+                        signature = current
+                    elif current != signature:
+                        raise ValueError("recordings differ in codec or size")
+                    time_base = in_stream.time_base
+                    shift = int(offset / time_base)
+                    end = 0
+                    for packet in src.demux(in_stream):
+                        if packet.dts is None:
+                            continue  # demuxer flush packet
+                        end = max(end, (packet.pts or packet.dts) + (packet.duration or 0))
+                        packet.dts += shift
+                        if packet.pts is not None:
+                            packet.pts += shift
+                        packet.stream = out_stream
+                        out.mux(packet)
+                    offset += float(end * time_base)
+    except Exception:
+        output.unlink(missing_ok=True)
+        return False
+    return output.exists()
+
+
+def _concat_webm_copy(ffmpeg: str, sources: list[Path], output: Path) -> bool:
+    """Join recordings with the concat demuxer, copying packets untouched.
+
+    Playwright records every scenario with the same codec and viewport, so the
+    demuxer path normally succeeds without decoding a single frame.
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", prefix="concat-", delete=False
+    ) as handle:
+        for source in sources:
+            escaped = str(source.resolve()).replace("'", "'\\''")
+            handle.write(f"file '{escaped}'\n")
+        list_path = Path(handle.name)
+    try:
+        # Regenerate missing pts and rebase the joined timeline at zero so
+        # players do not see a gap or negative start between segments.
+        cmd = [
+            ffmpeg,
+            "-y",
+            "-fflags",
+            "+genpts",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(list_path),
+            "-c",
+            "copy",
+            "-avoid_negative_ts",
+            "make_zero",
+            str(output),
+        ]
+        return run_ffmpeg(cmd, log_failure=False)
+    finally:
+        list_path.unlink(missing_ok=True)
+
+
+def _probe_video_signature(ffprobe: str, source: Path) -> str | None:
+    """Return ``codec,width,height`` of the first video stream via ffprobe."""
+    completed = subprocess.run(
+        [
+            ffprobe,
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=codec_name,width,height",
+            "-of",
+            "csv=p=0",
+            str(source),
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=False,
     )
-    for frame in frames:
-        frame.close()
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.decode("utf-8", "replace").strip() or None
+
+
+def _sources_match(sources: list[Path]) -> bool:
+    """True unless ffprobe shows the sources disagree on codec or frame size."""
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        return True
+    signatures = {_probe_video_signature(ffprobe, source) for source in sources}
+    return len(signatures) == 1 and None not in signatures
 
 
 def stitch_webm_ffmpeg(sources: list[Path], output: Path) -> bool:
+    """Join existing recordings into ``output``, copying packets when possible."""
+    if not sources:
+        return False
+    if _concat_webm_pyav(sources, output):
+        return True
     ffmpeg = shutil.which("ffmpeg")
     if not ffmpeg:
         return False
-    available = [source for source in sources if source.exists()]
-    if not available:
-        return False
-
+    # Stream copy only works for matching sources; skip the doomed attempt
+    # when ffprobe already shows they differ.
+    if _sources_match(sources) and _concat_webm_copy(ffmpeg, sources, output):
+        return True
+
+    # Sources disagree on codec parameters; fall back to a full re-encode.
+    # Nothing else runs by now, so the filter graph and encoder get every core.
+    cpu_count = str(os.cpu_count() or 1)
     cmd = [ffmpeg, "-y"]
-    for source in available:
+    for option in ("filter_threads", "filter_complex_threads"):
+        if ffmpeg_has_option(ffmpeg, option):
+            cmd.extend([f"-{option}", cpu_count])
+    for source in sources:
         cmd.extend(["-i", str(source)])
-    stream_concat = "".join(f"[{i}:v]" for i in range(len(available)))
+    stream_concat = "".join(f"[{i}:v]" for i in range(len(sources)))
     cmd.extend(
         [
             "-filter_complex",
-            f"{stream_concat}concat=n={len(available)}:v=1:a=0[v]",
+            f"{stream_concat}concat=n={len(sources)}:v=1:a=0[v]",
             "-map",
             "[v]",
             "-pix_fmt",
             "yuv420p",
+            "-threads",
+            "0",
             str(output),
         ]
     )
-    completed = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    return completed.returncode == 0 and output.exists()
+    return run_ffmpeg(cmd)
 
 
-def build_demo_reels(out_dir: Path, scenario_keys: list[str], frame_ms: int) -> None:
-    gif_sources = [out_dir / f"{key}.gif" for key in scenario_keys]
-    webm_sources = [out_dir / f"{key}.webm" for key in scenario_keys]
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def stat_reel_sources(paths: list[Path]) -> list[tuple[Path, os.stat_result]]:
+    """Stat every source at once, dropping (and reporting) missing or empty ones."""
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(paths)))) as pool:
+        stats = list(pool.map(_stat_or_none, paths))
+    metas: list[tuple[Path, os.stat_result]] = []
+    for path, stat in zip(paths, stats):
+        if stat is None or stat.st_size == 0:
+            print(f"[reels] skipping {path.name}: {'missing' if stat is None else 'empty'}")
+            continue
+        metas.append((path, stat))
+    return metas
 
+
+def build_demo_reels(
+    out_dir: Path,
+    gif_paths: list[Path],
+    webm_paths: list[Path],
+    frame_ms: int,
+) -> None:
+    metas = stat_reel_sources([*gif_paths, *webm_paths])
+    gif_sources = [path for path, _ in metas if path.suffix == ".gif"]
+    webm_sources = [path for path, _ in metas if path.suffix == ".webm"]
+    if not gif_sources and not webm_sources:
+        print("[reels] no scenario captures to stitch")
+        return
+
+    # Stitch the WebM first so its H.264 transcode (a separate ffmpeg
+    # process) runs while Pillow builds the GIF reels below.
+    transcode: threading.Thread | None = None
+    if stitch_webm_ffmpeg(webm_sources, out_dir / "demo-back-to-back.webm"):
+        transcode = threading.Thread(
+            target=maybe_convert_webm_to_mp4,
+            args=(out_dir / "demo-back-to-back.webm", out_dir / "demo-back-to-back.mp4"),
+        )
+        transcode.start()
+
+    palette = build_reel_palette(gif_sources[0]) if gif_sources else None
     stitch_gifs(
         gif_sources,
-        out_dir / "demo-back-to-back.gif",
-        default_duration_ms=frame_ms,
-        separator_hold_frames=0,
-    )
-    stitch_gifs(
-        gif_sources,
-        out_dir / "demo-stitched.gif",
+        [
+            (out_dir / "demo-back-to-back.gif", 0),
+            (out_dir / "demo-stitched.gif", 6),
+        ],
         default_duration_ms=frame_ms,
-        separator_hold_frames=6,
+        decoder="pyav",
+        palette=palette,
     )
-    if stitch_webm_ffmpeg(webm_sources, out_dir / "demo-back-to-back.webm"):
-        maybe_convert_webm_to_mp4(
-            out_dir / "demo-back-to-back.webm",
-            out_dir / "demo-back-to-back.mp4",
-        )
+    if palette is not None:
+        palette.close()
+    if transcode is not None:
+        transcode.join()
 
 
 def main() -> None:
-    global RESOLVED_WORKFLOW_ROUTE, RESOLVED_SESSION_IDS
     args = parse_args()
     out_dir = Path(args.out_dir).resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
     ensure_app_ready(args.base_url)
-    RESOLVED_WORKFLOW_ROUTE = resolve_workflow_route(args.base_url)
-    RESOLVED_SESSION_IDS = resolve_session_ids(args.base_url, count=4)
+    client = ApiClient(args.base_url)
+    try:
+        workflow_route = resolve_workflow_route(client)
+        session_ids = resolve_session_ids(client, count=4)
+    finally:
+        client.close()
+    ctx = ResolvedCtx(workflow_route=workflow_route, session_ids=tuple(session_ids))
 
     scenarios = [
       Scenario(
@@ -925,26 +1845,44 @@ def main() -> None:
       ),
     ]
 
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=True)
-        try:
-            scenario_keys = [scenario.key for scenario in scenarios]
-            for scenario in scenarios:
-                print(f"[capture] {scenario.key}")
-                capture_scenario(
-                    browser=browser,
-                    base_url=args.base_url,
-                    out_dir=out_dir,
-                    provider=args.provider,
-                    scenario=scenario,
-                    frame_ms=args.gif_ms,
-                    target_seconds=args.target_seconds,
-                )
-            build_demo_reels(out_dir, scenario_keys, frame_ms=args.gif_ms)
-        finally:
-            browser.close()
+    prewarm_routes(
+        args.base_url,
+        [scenario.route for scenario in scenarios] + [ctx.workflow_route],
+    )
+
+    # Each worker process drives its own Chromium (the sync Playwright API is
+    # single-threaded) and captures its share of scenarios back to back. Split
+    # the cores across concurrent encodes so ffmpeg runs don't oversubscribe.
+    cpu_count = os.cpu_count() or 1
+    jobs = args.jobs if args.jobs > 0 else cpu_count
+    jobs = max(1, min(len(scenarios), jobs))
+    encode_threads = max(1, cpu_count // min(len(scenarios), cpu_count))
+    batches = [scenarios[i::jobs] for i in range(jobs)]
+    batch_kwargs = dict(
+        base_url=args.base_url,
+        out_dir=out_dir,
+        provider=args.provider,
+        frame_ms=args.gif_ms,
+        target_seconds=args.target_seconds,
+        ctx=ctx,
+        encode_threads=encode_threads,
+    )
+    if jobs == 1:
+        capture_batch(scenarios, **batch_kwargs)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(capture_batch, batch, **batch_kwargs) for batch in batches]
+            for future in as_completed(futures):
+                for key in future.result():
+                    print(f"[capture] finished {key}")
+
+    gif_paths: list[Path] = []
+    webm_paths: list[Path] = []
+    for scenario in scenarios:
+        gif_paths.append(out_dir / f"{scenario.key}.gif")
+        webm_paths.append(out_dir / f"{scenario.key}.webm")
+    build_demo_reels(out_dir, gif_paths, webm_paths, frame_ms=args.gif_ms)
 
-    shutil.rmtree(out_dir / "_frames", ignore_errors=True)
     shutil.rmtree(out_dir / "_raw-video", ignore_errors=True)
     print(f"[capture] wrote assets to {out_dir}")
 